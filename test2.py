@@ -1,131 +1,423 @@
 import os
-import math
+import re
 import time
+import json
+import hashlib
 import shutil
-from pydub import AudioSegment
-from groq import Groq
+import asyncio
+import random
+import subprocess
+import importlib.util
+import httpx
+from groq import AsyncGroq, APIConnectionError, APIStatusError
 import gradio as gr
 
-# Initialize Groq client
-client = Groq(api_key="****************")
+# Initialize Groq client on one shared connection pool for audio and chat calls.
+# HTTP/2 (needs the optional h2 package) multiplexes uploads over a single TLS connection.
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    http2=importlib.util.find_spec("h2") is not None
+)
+# max_retries=0: with_backoff is the only retry layer (the SDK would otherwise retry silently)
+aclient = AsyncGroq(api_key="****************", http_client=http_client, max_retries=0)
 
 # === CONFIGURATION ===
 CHUNKS_DIR = "chunks"
 TRANSLATIONS_DIR = "translations"
-CHUNK_LENGTH_MS = 10 * 60 * 1000  # 10 minutes
+RESULTS_DIR = "results"
+TRANSLATION_FAILED = "[TRANSLATION FAILED"
+SUMMARY_FAILED = "⚠️ Summary generation failed"
+CHUNK_LENGTH_S = 10 * 60  # 10 minutes
+SILENCE_WINDOW_S = 30  # look this far either side of each cut for silence
+SILENCE_FILTER = "silencedetect=noise=-35dB:d=0.5"
+# "try again in XmY.Zs" hint in Groq rate-limit messages
+RATE_LIMIT_RE = re.compile(r'(\d+)m([\d.]+)s')
+RATE_LIMIT_TOKENS = ("429", "rate_limit", "too many requests")
+# Whisper resamples to 16 kHz mono anyway, so upload nothing more
+CHUNK_CODEC_ARGS = ["-ac", "1", "-ar", "16000", "-c:a", "libmp3lame", "-b:a", "32k"]
+# Groq meters audio and chat models in separate buckets, so each gets its own limits
+TRANSLATE_CONCURRENCY = int(os.environ.get("TRANSLATE_CONCURRENCY", "8"))
+SUMMARIZE_CONCURRENCY = int(os.environ.get("SUMMARIZE_CONCURRENCY", "16"))
+AUDIO_RPM = int(os.environ.get("GROQ_AUDIO_RPM", "20"))  # 0 disables
+CHAT_RPM = int(os.environ.get("GROQ_CHAT_RPM", "30"))  # 0 disables
+MAP_MODEL = "llama-3.1-8b-instant"  # per-chunk summaries
+REDUCE_MODEL = "llama-3.3-70b-versatile"  # final summary
+MAX_RETRIES = 5
+BACKOFF_BASE_S = 1
+BACKOFF_CAP_S = 60
+
+# Caps in-flight requests across all runs
+audio_sem = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+chat_sem = asyncio.Semaphore(SUMMARIZE_CONCURRENCY)
 
 # === Helper Functions ===
-def countdown(seconds):
-    """Show a countdown timer"""
-    for remaining in range(int(seconds), 0, -1):
-        mins, secs = divmod(remaining, 60)
-        timer = f'{mins:02d}:{secs:02d}'
-        yield f"⏳ Waiting for rate limit reset: {timer} remaining..."
-        time.sleep(1)
-    yield "✅ Wait complete! Resuming..."
+def coarse_progress(progress):
+    """Wrap a progress callback so it only fires when the whole percentage changes"""
+    last_pct = None
+    
+    def update(fraction, desc=None, force=False):
+        nonlocal last_pct
+        # force=True bypasses the throttle for one-off notices (rate-limit waits, retries)
+        pct = int(fraction * 100)
+        if force or pct != last_pct:
+            last_pct = pct
+            progress(fraction, desc=desc)
+    
+    return update
+
+def rate_limiter(rpm):
+    """Build an awaitable gate allowing at most `rpm` requests per 60s window"""
+    lock = asyncio.Lock()
+    window_start = 0.0
+    count = 0
+    
+    async def gate():
+        nonlocal window_start, count
+        if rpm <= 0:
+            return
+        async with lock:
+            now = time.monotonic()
+            if now - window_start >= 60:
+                window_start, count = now, 0
+            # Window full: wait it out here instead of collecting a 429
+            if count >= rpm:
+                await asyncio.sleep(window_start + 60 - now)
+                window_start, count = time.monotonic(), 0
+            count += 1
+    
+    return gate
+
+audio_gate = rate_limiter(AUDIO_RPM)
+chat_gate = rate_limiter(CHAT_RPM)
+
+def is_rate_limit(error_msg):
+    """Check whether an API error is a rate limit (429)"""
+    low = error_msg.lower()
+    return any(token in low for token in RATE_LIMIT_TOKENS)
+
+def is_retryable(error):
+    """Only rate limits, 5xx responses and dropped connections are worth retrying"""
+    if isinstance(error, APIConnectionError):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return is_rate_limit(str(error))
+
+def retry_delay(error, attempt):
+    """Work out how long to wait before retrying a failed request"""
+    # Prefer the server's own Retry-After hint (429 and 5xx responses)
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+    
+    # Fall back to the "try again in XmY.Zs" hint in the message
+    error_msg = str(error)
+    if is_rate_limit(error_msg):
+        match = RATE_LIMIT_RE.search(error_msg)
+        if match:
+            return int(match.group(1)) * 60 + float(match.group(2))
+    
+    # Exponential backoff with jitter
+    return min(BACKOFF_CAP_S, BACKOFF_BASE_S * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+async def with_backoff(fn, on_retry):
+    """Await fn() until it succeeds, backing off between failed attempts"""
+    for attempt in range(MAX_RETRIES):
+        try:
+            return await fn()
+        except Exception as e:
+            # Bad requests (400 bad file, 401 bad key, 413 too large) fail fast
+            if attempt == MAX_RETRIES - 1 or not is_retryable(e):
+                raise
+            await on_retry(e, retry_delay(e, attempt))
+
+def read_bytes(path):
+    """Read a whole file into memory"""
+    with open(path, "rb") as f:
+        return f.read()
+
+def file_sha256(path):
+    """Hash a file in blocks so large uploads never sit in memory"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def chunk_key(data):
+    """Content-hash cache key for a chunk's audio bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def read_translation(key):
+    """Load a cached translation by key, or None if not cached"""
+    translation_file = os.path.join(TRANSLATIONS_DIR, f"{key}.txt")
+    if not os.path.exists(translation_file):
+        return None
+    with open(translation_file, "r", encoding="utf-8") as f:
+        return f.read()
+
+def probe_duration(path):
+    """Get audio duration in seconds via ffprobe"""
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", path],
+        capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip())
 
-def split_audio(path, progress=gr.Progress()):
-    """Split audio into chunks"""
-    os.makedirs(CHUNKS_DIR, exist_ok=True)
+def find_silences(path, start_s, length_s):
+    """List silence midpoints (in seconds) within a window of the file"""
+    result = subprocess.run(
+        ["ffmpeg", "-nostats", "-ss", str(start_s), "-t", str(length_s), "-i", path,
+         "-vn", "-af", SILENCE_FILTER, "-f", "null", "-"],
+        capture_output=True, text=True, check=True
+    )
+    # Timestamps are relative to the seek point
+    starts = [float(t) for t in re.findall(r"silence_start: (-?[\d.]+)", result.stderr)]
+    ends = [float(t) for t in re.findall(r"silence_end: ([\d.]+)", result.stderr)]
+    ends += [length_s] * (len(starts) - len(ends))
+    return [start_s + (max(s, 0) + e) / 2 for s, e in zip(starts, ends)]
+
+def plan_boundaries(path, duration):
+    """Pick cut points near every 10-minute mark, snapped to the nearest silence"""
+    boundaries = [0.0]
+    target = CHUNK_LENGTH_S
+    while target < duration:
+        window_start = target - SILENCE_WINDOW_S
+        silences = [t for t in find_silences(path, window_start, 2 * SILENCE_WINDOW_S) if t < duration]
+        
+        # Fall back to a hard cut when nobody pauses near the mark
+        cut = min(silences, key=lambda t: abs(t - target)) if silences else target
+        boundaries.append(cut)
+        target = cut + CHUNK_LENGTH_S
     
-    progress(0, desc="Loading audio file...")
-    audio = AudioSegment.from_file(path)
-    total_chunks = math.ceil(len(audio) / CHUNK_LENGTH_MS)
+    boundaries.append(duration)
+    return boundaries
+
+def split_audio(path, chunk_dir, progress=gr.Progress()):
+    """Split audio into 16 kHz mono MP3 chunks, yielding (path, total_chunks) once each is written"""
+    os.makedirs(chunk_dir, exist_ok=True)
     
-    progress(0.1, desc=f"Splitting into {total_chunks} chunks...")
+    # Cut points are saved so a re-run needs no ffprobe or silence scan
+    boundaries_file = os.path.join(chunk_dir, "boundaries.json")
+    if os.path.exists(boundaries_file):
+        with open(boundaries_file, "r", encoding="utf-8") as f:
+            boundaries = json.load(f)
+    else:
+        progress(0, desc="Finding split points...")
+        boundaries = plan_boundaries(path, probe_duration(path))
+        # Same temp-then-rename as the chunks, so a half-written plan is never loaded
+        part_file = boundaries_file + ".part"
+        with open(part_file, "w", encoding="utf-8") as f:
+            json.dump(boundaries, f)
+        os.replace(part_file, boundaries_file)
+    total_chunks = len(boundaries) - 1
     
     for i in range(total_chunks):
-        start = i * CHUNK_LENGTH_MS
-        end = start + CHUNK_LENGTH_MS
-        chunk = audio[start:end]
+        start_s, end_s = boundaries[i], boundaries[i + 1]
         chunk_filename = f"chunk_{i+1:03}.mp3"
-        chunk_path = os.path.join(CHUNKS_DIR, chunk_filename)
+        chunk_path = os.path.join(chunk_dir, chunk_filename)
         
-        if not os.path.exists(chunk_path):
-            chunk.export(chunk_path, format="mp3")
+        # Skip chunks already on disk from a previous run
+        if not (os.path.exists(chunk_path) and os.path.getsize(chunk_path) > 0):
+            # Write to a temp file first so an interrupted run leaves no half chunk
+            part_path = chunk_path + ".part"
+            subprocess.run(
+                ["ffmpeg", "-y", "-v", "error", "-ss", str(start_s), "-t", str(end_s - start_s),
+                 "-i", path, "-vn", *CHUNK_CODEC_ARGS, "-f", "mp3", part_path],
+                check=True
+            )
+            os.replace(part_path, chunk_path)
         
-        progress((i + 1) / total_chunks * 0.2, desc=f"Created chunk {i+1}/{total_chunks}")
+        # Progress from here on is reported by the consumer, against the planned count
+        yield chunk_path, total_chunks
+
+async def split_audio_async(path, chunk_dir, progress=gr.Progress()):
+    """Run split_audio in a worker thread, yielding (path, total_chunks) as chunks appear"""
+    chunks = split_audio(path, chunk_dir, progress)
+    while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+        yield chunk
+
+async def translate_chunk(idx, file_path, manifest, report):
+    """Translate a single chunk, using the cached result if present"""
+    file_name = os.path.basename(file_path)
+    
+    # Skip if this chunk was already hashed and translated
+    key = manifest.get(str(idx))
+    text = read_translation(key) if key else None
+    if text is not None:
+        report(f"Loading cached: {file_name}")
+        return f"\n--- {file_name} ---\n{text}"
+    
+    # Read off the event loop so other uploads keep flowing meanwhile
+    data = await asyncio.to_thread(read_bytes, file_path)
+    key = chunk_key(data)
+    manifest[str(idx)] = key
+    
+    # Same audio may have been translated under another file or position
+    text = read_translation(key)
+    if text is not None:
+        report(f"Loading cached: {file_name}")
+        return f"\n--- {file_name} ---\n{text}"
     
-    return total_chunks
+    async def request():
+        report(f"Translating {file_name}...")
+        await audio_gate()
+        return await aclient.audio.translations.create(
+            file=(file_name, data, "audio/mpeg"),
+            model="whisper-large-v3",
+            response_format="json",
+            temperature=0
+        )
+    
+    async def wait(e, delay):
+        if is_rate_limit(str(e)):
+            report(f"⏳ Rate-limit wait {delay:.0f}s for {file_name}", force=True)
+        else:
+            report(f"Retrying {file_name} in {delay:.0f}s...", force=True)
+        await asyncio.sleep(delay)
+    
+    # Translate with retry, reusing the same buffer for every attempt
+    try:
+        translation = await with_backoff(request, wait)
+    except Exception as e:
+        return f"\n--- {file_name} ---\n{TRANSLATION_FAILED}: {str(e)}]"
+    finally:
+        # Drop the audio as soon as the upload is done
+        del data
+    
+    text = translation.text.strip()
+    
+    # Save immediately
+    with open(os.path.join(TRANSLATIONS_DIR, f"{key}.txt"), "w", encoding="utf-8") as out:
+        out.write(text)
+    
+    return f"\n--- {file_name} ---\n{text}"
 
-def translate_chunks(progress=gr.Progress()):
-    """Translate all chunks"""
+async def translate_chunks(chunk_dir, chunk_paths, transcript_file, progress, on_translated=None):
+    """Translate chunks concurrently as they arrive, writing them to transcript_file in order"""
+    # progress is a coarse_progress wrapper: it takes force=True for notices
     os.makedirs(TRANSLATIONS_DIR, exist_ok=True)
-    results = []
     
-    chunk_files = sorted([f for f in os.listdir(CHUNKS_DIR) if f.endswith(".mp3")])
-    total_files = len(chunk_files)
+    # Chunk index -> content key, so re-runs skip re-hashing
+    manifest_file = os.path.join(chunk_dir, "manifest.json")
+    manifest = {}
+    if os.path.exists(manifest_file):
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
     
-    for idx, file_name in enumerate(chunk_files):
-        file_path = os.path.join(CHUNKS_DIR, file_name)
-        translation_file = os.path.join(TRANSLATIONS_DIR, file_name.replace(".mp3", ".txt"))
-        
-        # Skip if already translated
-        if os.path.exists(translation_file):
-            progress(0.2 + (idx / total_files) * 0.6, desc=f"Loading cached: {file_name}")
-            with open(translation_file, "r", encoding="utf-8") as f:
-                text = f.read()
-            results.append(f"\n--- {file_name} ---\n{text}")
-            continue
-        
-        # Translate with retry
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                progress(0.2 + (idx / total_files) * 0.6, desc=f"Translating {file_name} ({idx+1}/{total_files})...")
-                
-                with open(file_path, "rb") as f:
-                    translation = client.audio.translations.create(
-                        file=f,
-                        model="whisper-large-v3",
-                        response_format="json",
-                        temperature=0
-                    )
-                
-                text = translation.text.strip()
-                
-                # Save immediately
-                with open(translation_file, "w", encoding="utf-8") as out:
-                    out.write(text)
-                
-                results.append(f"\n--- {file_name} ---\n{text}")
-                time.sleep(2)
-                break
-                
-            except Exception as e:
-                error_msg = str(e)
-                
-                # Handle rate limit
-                if "rate_limit" in error_msg.lower() or "429" in error_msg:
-                    wait_time = 180
-                    
-                    try:
-                        import re
-                        match = re.search(r'(\d+)m([\d.]+)s', error_msg)
-                        if match:
-                            wait_time = int(match.group(1)) * 60 + float(match.group(2))
-                    except:
-                        pass
-                    
-                    wait_time = int(wait_time) + 10
-                    
-                    # Show countdown in progress
-                    for msg in countdown(wait_time):
-                        progress(0.2 + (idx / total_files) * 0.6, desc=msg)
-                    continue
-                
-                # Other errors
-                if attempt < max_retries - 1:
-                    progress(0.2 + (idx / total_files) * 0.6, desc=f"Retrying {file_name}...")
-                    time.sleep(10)
-                else:
-                    results.append(f"\n--- {file_name} ---\n[TRANSLATION FAILED: {error_msg}]")
-                    break
-    
-    return "\n".join(results)
+    tasks = []
+    total_chunks = 0
+    completed = 0
+    # Finished chunks wait here only until every earlier chunk is written
+    pending = {}
+    next_idx = 0
+    
+    def write_ready(out):
+        nonlocal next_idx
+        while next_idx in pending:
+            if next_idx:
+                out.write("\n")
+            out.write(pending.pop(next_idx))
+            next_idx += 1
+    
+    def report(desc, force=False):
+        # One monotonic counter over splitting and translating: two steps per planned chunk
+        done = len(tasks) + completed
+        progress(done / (2 * total_chunks) * 0.8, desc=f"{desc} ({completed}/{total_chunks} done)", force=force)
+    
+    async def bounded(idx, file_path, out):
+        nonlocal completed
+        async with audio_sem:
+            text = await translate_chunk(idx, file_path, manifest, report)
+        completed += 1
+        # Let the caller start follow-up work (e.g. the summary map step) right away
+        if on_translated:
+            on_translated(idx, text, total_chunks)
+        pending[idx] = text
+        write_ready(out)
+    
+    with open(transcript_file, "w", encoding="utf-8") as out:
+        # Start translating each chunk while later ones are still being split.
+        # On any failure, stop the other tasks before `out` is closed under them.
+        try:
+            async for chunk_path, total_chunks in chunk_paths:
+                tasks.append(asyncio.create_task(bounded(len(tasks), chunk_path, out)))
+                report(f"Created chunk {len(tasks)}/{total_chunks}")
+            
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    
+    return len(tasks)
+
+async def chat(model, prompt, max_tokens):
+    """Run a chat completion with retry and return the reply text"""
+    async def request():
+        await chat_gate()
+        response = await aclient.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that creates clear, structured summaries."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+    
+    async def wait(e, delay):
+        await asyncio.sleep(delay)
+    
+    return await with_backoff(request, wait)
+
+async def summarize_chunk(text):
+    """Condense one chunk of transcript into a short bullet summary (map step)"""
+    prompt = f"""Summarize this part of a council meeting transcript in at most 150 words of bullet points.
+Keep every decision, action item, name, number and date that is mentioned.
+
+Transcript part:
+{text}
+"""
+    
+    async with chat_sem:
+        try:
+            return await chat(MAP_MODEL, prompt, max_tokens=400)
+        except Exception:
+            # Let the reduce step see the raw text rather than lose the chunk
+            return text
 
-def summarize_text(text, progress=gr.Progress()):
-    """Generate summary"""
+async def summarize_text(text, partials, total_chunks, progress=gr.Progress()):
+    """Generate summary, reducing the per-chunk map summaries (chunk index -> task) for multi-chunk files"""
+    # Nothing was translated, so there is nothing worth sending to the model
+    if total_chunks > 1:
+        usable = bool(partials)
+    else:
+        usable = bool(text.strip()) and TRANSLATION_FAILED not in text
+    if not usable:
+        return f"{SUMMARY_FAILED}: no chunk could be translated"
+    
+    if total_chunks > 1:
+        progress(0.85, desc=f"Summarizing {len(partials)} chunks...")
+        order = sorted(partials)
+        results = await asyncio.gather(*(partials[i] for i in order))
+        text = "\n\n".join(f"Part {i+1}:\n{p}" for i, p in zip(order, results))
+        heading = "Summaries of consecutive parts of the transcript:"
+    else:
+        # A single chunk goes straight to the reduce model
+        heading = "Transcript:"
+    
     progress(0.9, desc="Generating summary...")
     
     prompt = f"""You are an expert at summarizing council meeting transcripts. 
@@ -137,58 +429,91 @@ Include:
 - Action items
 - Any significant announcements
 
-Transcript:
+{heading}
 {text}
 """
     
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that creates clear, structured summaries."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=2000
-        )
-        return response.choices[0].message.content
+        return await chat(REDUCE_MODEL, prompt, max_tokens=2000)
     
     except Exception as e:
-        return f"⚠️ Summary generation failed: {str(e)}"
+        return f"{SUMMARY_FAILED}: {str(e)}"
 
 # === Main Processing Function ===
-def process_audio(audio_file, progress=gr.Progress()):
+async def process_audio(audio_file, progress=gr.Progress()):
     """Main function to process audio and return transcript + summary"""
     
     if audio_file is None:
         return "❌ Please upload an audio file", "", None, None
     
     try:
-        # Clean up previous runs
-        if os.path.exists(CHUNKS_DIR):
-            shutil.rmtree(CHUNKS_DIR)
-        if os.path.exists(TRANSLATIONS_DIR):
-            shutil.rmtree(TRANSLATIONS_DIR)
-        
+        # Concurrent chunks report often; only forward visible changes to the UI
+        progress = coarse_progress(progress)
         progress(0, desc="Starting processing...")
         
-        # Step 1: Split audio
-        total_chunks = split_audio(audio_file, progress)
+        # Chunks and results of the same input always land in the same folders
+        input_hash = await asyncio.to_thread(file_sha256, audio_file)
+        chunk_dir = os.path.join(CHUNKS_DIR, input_hash)
+        result_dir = os.path.join(RESULTS_DIR, input_hash)
+        transcript_file = os.path.join(result_dir, "full_transcript.txt")
+        summary_file = os.path.join(result_dir, "summary.txt")
+        
+        # Identical re-upload: skip splitting and translation entirely
+        if os.path.exists(transcript_file) and os.path.exists(summary_file):
+            with open(transcript_file, "r", encoding="utf-8") as f:
+                full_transcript = f.read()
+            with open(summary_file, "r", encoding="utf-8") as f:
+                summary = f.read()
+            progress(1.0, desc="✅ Loaded from cache!")
+            return (
+                "✅ Loaded previous results for this file!",
+                full_transcript,
+                summary,
+                transcript_file,
+                summary_file
+            )
+        
+        # Steps 1 + 2: Split audio, translating chunks as they are written
+        # and condensing each chunk for the summary as soon as it is translated
+        partials = {}
+        failed = False
+        
+        def on_translated(idx, text, total_chunks):
+            nonlocal failed
+            if TRANSLATION_FAILED in text:
+                failed = True
+            # Single-chunk files skip the map step; failed chunks have nothing to summarize
+            elif total_chunks > 1:
+                partials[idx] = asyncio.create_task(summarize_chunk(text))
         
-        # Step 2: Translate chunks
-        full_transcript = translate_chunks(progress)
+        # The transcript is streamed to disk chunk by chunk, never joined in memory
+        os.makedirs(chunk_dir, exist_ok=True)
+        working_transcript = os.path.join(chunk_dir, "full_transcript.txt")
+        chunk_paths = split_audio_async(audio_file, chunk_dir, progress)
+        try:
+            total_chunks = await translate_chunks(
+                chunk_dir, chunk_paths, working_transcript, progress, on_translated=on_translated
+            )
+        except BaseException:
+            for task in partials.values():
+                task.cancel()
+            raise
+        with open(working_transcript, "r", encoding="utf-8") as f:
+            full_transcript = f.read()
         
         # Step 3: Generate summary
-        summary = summarize_text(full_transcript, progress)
+        summary = await summarize_text(full_transcript, partials, total_chunks, progress)
         
         progress(1.0, desc="✅ Complete!")
         
-        # Save to files for download
-        transcript_file = "full_transcript.txt"
-        summary_file = "summary.txt"
+        # Save to files for download; only complete runs are cached
+        if failed or summary.startswith(SUMMARY_FAILED):
+            transcript_file = "full_transcript.txt"
+            summary_file = "summary.txt"
+        else:
+            os.makedirs(result_dir, exist_ok=True)
         
-        with open(transcript_file, "w", encoding="utf-8") as f:
-            f.write(full_transcript)
+        os.replace(working_transcript, transcript_file)
         
         with open(summary_file, "w", encoding="utf-8") as f:
             f.write(summary)
@@ -204,6 +529,13 @@ def process_audio(audio_file, progress=gr.Progress()):
     except Exception as e:
         return f"❌ Error: {str(e)}", "", "", None, None
 
+def clear_cache():
+    """Delete cached chunks, translations and results from previous runs"""
+    for cache_dir in (CHUNKS_DIR, TRANSLATIONS_DIR, RESULTS_DIR):
+        if os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+    return "🗑️ Cache cleared"
+
 # === Gradio Interface ===
 with gr.Blocks(theme=gr.themes.Soft(), title="Audio Transcription & Summary") as demo:
     
@@ -223,6 +555,7 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Audio Transcription & Summary") as
             )
             
             process_btn = gr.Button("🚀 Process Audio", variant="primary", size="lg")
+            clear_btn = gr.Button("🗑️ Clear cache", variant="secondary")
             
             status_output = gr.Textbox(
                 label="Status",
@@ -260,6 +593,8 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Audio Transcription & Summary") as
         ]
     )
     
+    clear_btn.click(fn=clear_cache, outputs=[status_output])
+    
     gr.Markdown("""
     ---
     ### 💡 Tips: